@@ -0,0 +1,97 @@
+# benchmark_startup.py
+#!/usr/bin/env python3
+"""Compare cold-start time and RSS of the data loading paths.
+
+Every run happens in a fresh interpreter so nothing is warm. Third-party
+imports (Flask, NumPy, aiohttp, ...) are loaded before the clock starts,
+so the numbers cover the data loading itself:
+
+  legacy    json.load of every file + list concatenation (old load_json_data path)
+  json      full `import app` with the compiled snapshot disabled
+  compiled  full `import app` reading sports_data.snapshot
+
+Run `python create_all_databases.py --snapshot-only` first so the
+compiled snapshot exists.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RUNS = int(os.environ.get('BENCHMARK_RUNS', 5))
+
+LEGACY_LOAD = '''
+import json, os
+def load_json_data(filename, default=None):
+    if os.path.exists(filename):
+        with open(filename, 'r') as f:
+            return json.load(f)
+    return default
+players_data = load_json_data('players_data.json', {})
+nfl_players_data = load_json_data('nfl_players_data.json', [])
+mlb_players_data = load_json_data('mlb_players_data.json', [])
+nhl_players_data = load_json_data('nhl_players_data.json', [])
+fantasy_teams_data = load_json_data('fantasy_teams_data.json', [])
+sports_stats_database = load_json_data('sports_stats_database.json', {})
+players_data_list = players_data.get('players', []) if isinstance(players_data, dict) else players_data
+all_players_data = []
+all_players_data.extend(players_data_list)
+all_players_data.extend(nfl_players_data)
+all_players_data.extend(mlb_players_data)
+all_players_data.extend(nhl_players_data)
+'''
+
+APP_IMPORT = '''
+import contextlib, io
+with contextlib.redirect_stdout(io.StringIO()):
+    import app
+'''
+
+CHILD = '''
+import json, os, time
+import flask, flask_cors, requests, dotenv, aiohttp, asyncio, bs4, numpy
+
+def rss_kb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+
+baseline_kb = rss_kb()
+start = time.perf_counter()
+exec(compile({code!r}, 'benchmark', 'exec'))
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'rss_kb': rss_kb(), 'rss_delta_kb': rss_kb() - baseline_kb}}))
+'''
+
+SCENARIOS = {
+    'legacy': (LEGACY_LOAD, {}),
+    'json': (APP_IMPORT, {'COMPILED_SNAPSHOT_FILE': ''}),
+    'compiled': (APP_IMPORT, {})
+}
+
+def run_once(code, extra_env):
+    # No background reloads, warmup or cache persistence: they add work
+    # outside the measured load and print after the result line
+    env = dict(os.environ, DATA_RELOAD_INTERVAL='0', CACHE_WARMUP_PLAN='', CACHE_PERSIST_FILE='', **extra_env)
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD.format(code=code)],
+        capture_output=True, text=True, env=env, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    if not os.path.exists('sports_data.snapshot'):
+        print("⚠️ sports_data.snapshot not found - run: python create_all_databases.py --snapshot-only")
+
+    print(f"⏱️ Startup benchmark ({RUNS} cold runs each)")
+    print("-" * 50)
+    print(f"{'scenario':<10} {'median ms':>10} {'min ms':>10} {'RSS MB':>8} {'+data MB':>9}")
+    for name, (code, extra_env) in SCENARIOS.items():
+        samples = [run_once(code, extra_env) for _ in range(RUNS)]
+        times = [s['seconds'] * 1000 for s in samples]
+        rss_mb = statistics.median(s['rss_kb'] for s in samples) / 1024
+        delta_mb = statistics.median(s['rss_delta_kb'] for s in samples) / 1024
+        print(f"{name:<10} {statistics.median(times):>10.1f} {min(times):>10.1f} {rss_mb:>8.1f} {delta_mb:>9.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,37 @@
 import subprocess
 import json
 import os
+import sys
+
+# Compiled snapshot read by app.py at startup. It holds app.py's built
+# stores, so app.py writes it (write_compiled_snapshot) from a fresh JSON load.
+COMPILED_SNAPSHOT_FILE = os.environ.get('COMPILED_SNAPSHOT_FILE', 'sports_data.snapshot')
+COMPILE_SNAPSHOT = (
+    'import sys, app; '
+    'sys.exit(0 if app.write_compiled_snapshot(app.get_snapshot(), sys.argv[1]) else 1)'
+)
+
+def write_compiled_snapshot():
+    """Build app.py's data snapshot from the JSON files and pickle it for fast startup"""
+    # Force a JSON load and keep the import free of background work
+    env = dict(
+        os.environ,
+        COMPILED_SNAPSHOT_FILE='',
+        PLAYER_STORAGE_BACKEND='memory',
+        DATA_RELOAD_INTERVAL='0',
+        CACHE_WARMUP_PLAN='',
+        CACHE_PERSIST_FILE=''
+    )
+    try:
+        subprocess.run([sys.executable, '-c', COMPILE_SNAPSHOT, COMPILED_SNAPSHOT_FILE], check=True, env=env)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Error compiling snapshot: {e}")
+        return False
+    return True
+
+if '--snapshot-only' in sys.argv:
+    # Build step: compile the committed JSON files without regenerating them
+    sys.exit(0 if write_compiled_snapshot() else 1)
 
 print("🎯 Creating Comprehensive Sports Databases")
 print("=" * 50)
@@ -56,6 +87,7 @@ for db_file, db_name in databases.items():
 
 print("-" * 50)
 print(f"🎯 Total Players Across All Sports: {total_players:,}")
+write_compiled_snapshot()
 print("=" * 50)
 print("\n🚀 All databases created successfully!")
 print("💡 Next steps:")
@@ -0,0 +1,130 @@
+# create_sqlite_database.py
+#!/usr/bin/env python3
+"""Import the JSON databases into SQLite for PLAYER_STORAGE_BACKEND=sqlite.
+
+Indexed columns mirror the PlayerStore indexes in app.py (team and
+position upper-cased, injury status lower-cased); the full record is kept
+as JSON in the data column.
+"""
+import json
+import os
+import sqlite3
+
+SQLITE_DATABASE_FILE = os.environ.get('SQLITE_DATABASE_FILE', 'sports_data.sqlite3')
+SQLITE_SCHEMA_VERSION = 2  # must match SQLITE_SCHEMA_VERSION in app.py
+
+PLAYER_DATA_FILES = {
+    'nba': 'players_data.json',
+    'nfl': 'nfl_players_data.json',
+    'mlb': 'mlb_players_data.json',
+    'nhl': 'nhl_players_data.json'
+}
+
+SCHEMA = '''
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE players (
+    seq INTEGER PRIMARY KEY,
+    id TEXT,
+    sport TEXT NOT NULL,
+    name TEXT,
+    team TEXT,
+    position TEXT,
+    injury_status TEXT,
+    salary REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX idx_players_id ON players (id);
+CREATE INDEX idx_players_sport ON players (sport, seq);
+CREATE INDEX idx_players_team ON players (sport, team, seq);
+CREATE INDEX idx_players_position ON players (sport, position, seq);
+CREATE INDEX idx_players_injury_status ON players (sport, injury_status, seq);
+CREATE INDEX idx_players_salary ON players (sport, salary);
+CREATE TABLE fantasy_teams (
+    seq INTEGER PRIMARY KEY,
+    id TEXT,
+    sport TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX idx_fantasy_teams_id ON fantasy_teams (id);
+CREATE INDEX idx_fantasy_teams_sport ON fantasy_teams (sport, seq);
+'''
+
+def load_json(filename):
+    with open(filename, 'r') as f:
+        return json.load(f)
+
+def player_row(sport, player):
+    name = player.get('name') or player.get('playerName')
+    team = player.get('teamAbbrev') or player.get('team')
+    position = player.get('position') or player.get('pos')
+    injury_status = player.get('injuryStatus')
+    salary = player.get('salary')
+    return (
+        str(player['id']) if player.get('id') is not None else None,
+        sport,
+        name,
+        str(team).upper() if team else None,
+        str(position).upper() if position else None,
+        str(injury_status).lower() if injury_status else None,
+        salary if isinstance(salary, (int, float)) else None,
+        json.dumps(player, separators=(',', ':'))
+    )
+
+def create_sqlite_database(path=SQLITE_DATABASE_FILE):
+    """Build the database next to the target and swap it in atomically"""
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    conn.executescript(SCHEMA)
+
+    players_metadata = {}
+    total_players = 0
+    for sport, filename in PLAYER_DATA_FILES.items():
+        data = load_json(filename)
+        if isinstance(data, dict) and 'players' in data:
+            if sport == 'nba':
+                players_metadata = data
+            data = data.get('players', [])
+        rows = [player_row(sport, player) for player in data]
+        conn.executemany(
+            'INSERT INTO players (id, sport, name, team, position, injury_status, salary, data) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            rows
+        )
+        total_players += len(rows)
+        print(f"✅ {sport.upper()}: {len(rows):,} players")
+
+    teams = load_json('fantasy_teams_data.json')
+    if isinstance(teams, dict):
+        teams = teams.get('teams', [])
+    conn.executemany(
+        'INSERT INTO fantasy_teams (id, sport, data) VALUES (?, ?, ?)',
+        [
+            (str(team.get('id')), str(team.get('sport', '')).lower(), json.dumps(team, separators=(',', ':')))
+            for team in teams
+        ]
+    )
+    print(f"✅ Fantasy Teams: {len(teams):,} teams")
+
+    # The players list itself lives in the players table
+    metadata = {k: v for k, v in players_metadata.items() if k != 'players'}
+    conn.executemany('INSERT INTO meta (key, value) VALUES (?, ?)', [
+        ('schema_version', str(SQLITE_SCHEMA_VERSION)),
+        ('players_metadata', json.dumps(metadata))
+    ])
+    conn.commit()
+    conn.execute('ANALYZE')
+    conn.close()
+
+    os.replace(tmp_path, path)
+    print(f"🎯 {path}: {total_players:,} players, {len(teams):,} teams")
+
+if __name__ == '__main__':
+    print("🗄️ Importing JSON databases into SQLite")
+    print("=" * 50)
+    create_sqlite_database()
@@ -0,0 +1,63 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep the import side-effect free: no background reloader, warmup, cache
+# persistence or cross-worker files shared with a running server
+os.environ.update({
+    'DATA_RELOAD_INTERVAL': '0',
+    'CACHE_WARMUP_PLAN': '',
+    'CACHE_PERSIST_FILE': '',
+    'SHARED_CACHE_FILE': '',
+    'COMPILED_SNAPSHOT_FILE': '',
+    'RATE_LIMIT_BACKEND': 'memory',
+    'PLAYER_STORAGE_BACKEND': 'memory'
+})
+# The data files are opened relative to the working directory
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+import app as app_module  # noqa: E402
+
+
+class RecordingLimiter(app_module.SlidingWindowLimiter):
+    """SlidingWindowLimiter that remembers every settlement adjustment"""
+
+    def __init__(self):
+        super().__init__(app_module.RATE_LIMIT_MAX_KEYS)
+        self.adjustments = []
+
+    def adjust(self, key, window, delta, charged_at):
+        self.adjustments.append(round(delta, 6))
+        super().adjust(key, window, delta, charged_at)
+
+
+@pytest.fixture
+def app():
+    return app_module
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = RecordingLimiter()
+    monkeypatch.setattr(app_module, 'rate_limiter', limiter)
+    return limiter
+
+
+@pytest.fixture
+def client(limiter):
+    app_module.response_cache.clear()
+    yield app_module.app.test_client()
+    app_module.response_cache.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the app module; advance with clock[0] += s"""
+    now = [1_000_000.0]
+    fake_time = type('FakeTime', (), {'time': staticmethod(lambda: now[0]), 'sleep': staticmethod(lambda s: None)})
+    monkeypatch.setattr(app_module, 'time', fake_time)
+    return now
@@ -0,0 +1,115 @@
+import pytest
+
+
+def walk_pages(client, url):
+    """Every player of a cursor-paginated listing, following next_cursor"""
+    players = []
+    cursor = None
+    while True:
+        page = client.get(url + (f'&cursor={cursor}' if cursor else '')).get_json()
+        assert page['success']
+        players.extend(page['players'])
+        cursor = page['next_cursor']
+        if not cursor:
+            return players, page['total']
+
+
+def test_cursor_round_trip(app):
+    cursor = app.encode_cursor(42, 'abc123')
+    assert '=' not in cursor
+    assert app.decode_cursor(cursor) == ('abc123', 42)
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', 'YWJj', ''])
+def test_malformed_cursor_is_rejected(app, cursor):
+    args = app.app.test_request_context(f'/?cursor={cursor}').request.args
+    if not cursor:
+        assert app.parse_page_args(args, 'etag', 10) == (None, 10)
+        return
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        app.parse_page_args(args, 'etag', 10)
+
+
+def test_cursor_from_another_data_version_is_rejected(app):
+    args = app.app.test_request_context(f'/?cursor={app.encode_cursor(5, "old")}').request.args
+    with pytest.raises(ValueError, match='Cursor expired'):
+        app.parse_page_args(args, 'new', 10)
+
+
+def test_page_size_is_clamped(app):
+    args = app.app.test_request_context('/?page_size=0').request.args
+    assert app.parse_page_args(args, 'etag', 10) == (None, 1)
+    args = app.app.test_request_context(f'/?page_size={app.MAX_PAGE_SIZE + 1}').request.args
+    assert app.parse_page_args(args, 'etag', 10) == (None, app.MAX_PAGE_SIZE)
+
+
+def test_keyset_pages_cover_every_item_once(app):
+    items = list(range(1, 24))
+    seen, after = [], None
+    while True:
+        page, after = app.keyset_page(items, lambda item: item, after, page_size=5)
+        seen.extend(page)
+        if after is None:
+            break
+    assert seen == items
+
+
+def test_keyset_page_resumes_after_removed_items(app):
+    # Removing an item already served does not shift the next page
+    page, after = app.keyset_page(list(range(1, 11)), lambda item: item, None, page_size=3)
+    assert page == [1, 2, 3]
+    page, _ = app.keyset_page([1, 3, 4, 5, 6], lambda item: item, after, page_size=3)
+    assert page == [4, 5, 6]
+
+
+def test_player_listing_pages_are_stable_and_complete(client):
+    players, total = walk_pages(client, '/api/players?sport=nba&page_size=100')
+    ids = [player['id'] for player in players]
+    assert len(ids) == len(set(ids))
+    assert total >= len(ids) > 100
+    again, _ = walk_pages(client, '/api/players?sport=nba&page_size=100')
+    assert [player['id'] for player in again] == ids
+
+
+def test_stale_cursor_gets_a_400(app, client):
+    response = client.get(f'/api/players?sport=nba&cursor={app.encode_cursor(10, "old-data")}')
+    assert response.status_code == 400
+    assert 'Cursor expired' in response.get_json()['error']
+
+
+def test_parse_fields_builds_a_nested_selection(app):
+    args = app.app.test_request_context('/?fields=name, stats.points,stats.assists,team').request.args
+    assert app.parse_fields(args) == {'name': None, 'stats': {'points': None, 'assists': None}, 'team': None}
+    args = app.app.test_request_context('/?fields=stats,stats.points').request.args
+    assert app.parse_fields(args) == {'stats': None}
+    args = app.app.test_request_context('/?fields=,').request.args
+    assert app.parse_fields(args) is None
+
+
+def test_project_fields_copies_only_the_selection(app):
+    value = [{'name': 'A', 'team': 'X', 'stats': {'points': 1, 'assists': 2}}, {'name': 'B'}]
+    selection = {'name': None, 'stats': {'points': None}}
+    assert app.project_fields(value, selection) == [{'name': 'A', 'stats': {'points': 1}}, {'name': 'B'}]
+    assert app.project_fields(value, None) is value
+
+
+def test_players_endpoint_applies_fields(client):
+    players = client.get('/api/players?sport=nba&limit=5&fields=name,stats.points').get_json()['players']
+    assert players
+    assert all(set(player) == {'name', 'stats'} and set(player['stats']) == {'points'} for player in players)
+
+
+def test_player_record_folds_equal_aliases(app):
+    record = app.PlayerRecord({'name': 'A', 'playerName': 'A', 'pts': 20, 'ownership': 5, 'own': 6})
+    assert record.points == 20
+    assert record.get('playerName') == 'A' and record.get('pts') == 20
+    # A differing alias value is kept under its own key
+    assert record.ownership == 5 and record.extra == {'own': 6}
+
+
+def test_player_record_round_trips_its_source_keys(app):
+    source = {'id': 7, 'playerName': 'A', 'name': 'A', 'pts': 20, 'fdSalary': 5000, 'custom': True}
+    record = app.PlayerRecord(source)
+    assert record.to_dict(legacy=True) == source
+    assert record.to_dict() == {'id': 7, 'name': 'A', 'points': 20, 'fanDuelSalary': 5000, 'custom': True}
+    assert record.to_dict(fields={'name': None, 'pts': None}) == {'name': 'A', 'pts': 20}
@@ -0,0 +1,116 @@
+import math
+
+import pytest
+
+
+WINDOW = 60
+
+
+def window_start(index):
+    return float(index * WINDOW)
+
+
+def test_allows_up_to_the_limit_then_refuses(app):
+    limiter = app.SlidingWindowLimiter(100)
+    now = window_start(1000) + 1
+    for _ in range(5):
+        assert limiter.hit('client', 5, WINDOW, now=now) == (True, 0)
+    allowed, retry_after = limiter.hit('client', 5, WINDOW, now=now)
+    assert not allowed
+    assert retry_after >= 1
+
+
+def test_previous_window_counts_by_its_remaining_overlap(app):
+    limiter = app.SlidingWindowLimiter(100)
+    for _ in range(10):
+        assert limiter.hit('client', 10, WINDOW, now=window_start(1000) + 30)[0]
+    # Halfway into the next window half of the previous count still applies
+    now = window_start(1001) + 30
+    for _ in range(5):
+        assert limiter.hit('client', 10, WINDOW, now=now)[0]
+    assert not limiter.hit('client', 10, WINDOW, now=now)[0]
+
+
+def test_keys_are_counted_separately(app):
+    limiter = app.SlidingWindowLimiter(100)
+    now = window_start(1000)
+    assert limiter.hit('a', 1, WINDOW, now=now)[0]
+    assert not limiter.hit('a', 1, WINDOW, now=now)[0]
+    assert limiter.hit('b', 1, WINDOW, now=now)[0]
+
+
+@pytest.mark.parametrize('limit, previous, current, offset, cost', [
+    (10, 10, 5, 30, 1),   # waits for the previous window to slide out
+    (10, 4, 6, 10, 1),    # frees up later in this window
+    (10, 0, 10, 45, 1),   # only the next window has room
+    (10, 8, 2, 5, 3),     # costlier request
+    (30, 60, 22, 55, 5)   # refused just before the boundary
+])
+def test_retry_after_is_the_first_moment_the_request_fits(app, limit, previous, current, offset, cost):
+    retry_after = app.sliding_window_retry_after(limit, WINDOW, offset, current, previous, cost)
+
+    def used_at(elapsed):
+        at = offset + elapsed
+        if at < WINDOW:
+            return previous * (1 - at / WINDOW) + current
+        return current * (1 - (at - WINDOW) / WINDOW)
+
+    assert used_at(0) + cost > limit
+    assert retry_after > 0
+    assert used_at(retry_after) + cost <= limit + 1e-9
+    assert used_at(retry_after - 0.5) + cost > limit
+
+
+def test_retry_after_for_a_cost_above_the_limit(app):
+    assert app.sliding_window_retry_after(5, WINDOW, 20, 0, 0, 6) == 2 * WINDOW - 20
+
+
+def test_hit_reports_a_whole_number_of_seconds_that_is_honoured(app):
+    limiter = app.SlidingWindowLimiter(100)
+    start = window_start(1000) + 17.3
+    for _ in range(10):
+        limiter.hit('client', 10, WINDOW, now=start)
+    allowed, retry_after = limiter.hit('client', 10, WINDOW, now=start + 1)
+    assert not allowed
+    assert retry_after == math.ceil(retry_after)
+    assert limiter.hit('client', 10, WINDOW, now=start + 1 + retry_after)[0]
+
+
+def test_adjust_refunds_and_surcharges_the_charged_window(app):
+    limiter = app.SlidingWindowLimiter(100)
+    now = window_start(1000)
+    assert limiter.hit('client', 10, WINDOW, cost=10, now=now)[0]
+    assert not limiter.hit('client', 10, WINDOW, now=now)[0]
+    limiter.adjust('client', WINDOW, -9, now)
+    assert limiter.hit('client', 10, WINDOW, now=now)[0]
+    limiter.adjust('client', WINDOW, 8, now)
+    assert not limiter.hit('client', 10, WINDOW, now=now)[0]
+
+
+def test_cache_hits_are_refunded_to_the_hit_cost(app, client, limiter, monkeypatch):
+    monkeypatch.setattr(app, 'scrape_secret_phrases', lambda: {'success': True, 'phrases': []})
+    assert client.get('/api/secret-phrases').headers['X-Cache'] == 'MISS'
+    assert client.get('/api/secret-phrases').headers['X-Cache'] == 'HIT'
+    assert limiter.adjustments == [app.RATE_LIMIT_MISS_SURCHARGE, app.RATE_LIMIT_CACHE_HIT_COST - 1]
+
+
+def test_not_modified_is_refunded_to_the_304_cost(app, client, limiter):
+    etag = client.get('/api/players?sport=nba&limit=5').headers['ETag']
+    response = client.get('/api/players?sport=nba&limit=5', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert limiter.adjustments == [app.RATE_LIMIT_NOT_MODIFIED_COST - 1]
+
+
+def test_only_metered_upstream_loads_are_surcharged(app, client, limiter):
+    # A local cache miss runs its loader but calls no quota-metered upstream
+    assert client.get('/api/fantasy/players?sport=nba&limit=5').headers['X-Cache'] == 'MISS'
+    assert limiter.adjustments == []
+
+
+def test_waiting_on_another_requests_fetch_is_not_surcharged(app, limiter, monkeypatch):
+    entry = app.response_cache.set('secret_phrases', {'test': 'waiter'}, {'success': True})
+    monkeypatch.setattr(app.upstream_flight, 'do', lambda key, fn, timeout=None: entry)
+    with app.app.test_request_context('/api/secret-phrases'):
+        assert app.load_once('secret_phrases', {'test': 'waiter'}, lambda: None) is entry
+        assert not getattr(app.flask_request, 'upstream_fetched', False)
+    app.response_cache.clear('secret_phrases')
@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+
+NAMESPACES = {
+    'plain': (60, 3, False),
+    'odds': (60, 100, False),
+    'roomy': (60, 100, False)
+}
+
+
+@pytest.fixture
+def cache(app, clock):
+    return app.ResponseCache(NAMESPACES, 100, 10 ** 6, stale_windows={'odds': 30})
+
+
+def test_set_returns_a_miss_and_get_a_hit_with_the_same_body(app, cache):
+    stored = cache.set('plain', {'q': 1}, {'value': 1})
+    assert stored.status == 'MISS'
+    hit = cache.get('plain', {'q': 1})
+    assert hit.status == 'HIT'
+    assert hit.etag == stored.etag
+    assert json.loads(app.ResponseCache.body(hit.payload)) == {'value': 1}
+
+
+def test_params_key_ignores_order(cache):
+    cache.set('plain', {'a': 1, 'b': 2}, {'value': 1})
+    assert cache.get('plain', {'b': 2, 'a': 1}) is not None
+    assert cache.get('plain', {'a': 1, 'b': 3}) is None
+
+
+def test_entries_expire_after_their_ttl(cache, clock):
+    cache.set('plain', {'q': 1}, {'value': 1})
+    cache.set('plain', {'q': 2}, {'value': 2}, ttl=120)
+    clock[0] += 59
+    assert cache.get('plain', {'q': 1}).ttl == pytest.approx(1)
+    clock[0] += 1
+    assert cache.get('plain', {'q': 1}) is None
+    assert cache.get('plain', {'q': 2}) is not None
+    assert cache.stats()['namespaces']['plain']['expired'] == 1
+
+
+def test_stale_window_serves_expired_entries_only_when_asked(cache, clock):
+    cache.set('odds', {'q': 1}, {'value': 1})
+    clock[0] += 70
+    assert cache.get('odds', {'q': 1}) is None
+    stale = cache.get('odds', {'q': 1}, allow_stale=True)
+    assert stale.stale and stale.status == 'STALE' and stale.ttl == 0
+    clock[0] += 30
+    assert cache.get('odds', {'q': 1}, allow_stale=True) is None
+
+
+def test_namespace_limit_evicts_its_least_recently_used_entry(cache):
+    for q in range(3):
+        cache.set('plain', {'q': q}, {'value': q})
+    cache.set('roomy', {'q': 0}, {'value': 0})
+    assert cache.get('plain', {'q': 0}) is not None  # now most recently used
+    cache.set('plain', {'q': 3}, {'value': 3})
+    assert cache.get('plain', {'q': 1}) is None
+    assert all(cache.get('plain', {'q': q}) is not None for q in (0, 2, 3))
+    assert cache.get('roomy', {'q': 0}) is not None
+    assert cache.stats()['namespaces']['plain']['evictions'] == 1
+
+
+def test_entry_budget_evicts_globally_least_recently_used(app, clock):
+    cache = app.ResponseCache(NAMESPACES, 2, 10 ** 6)
+    cache.set('roomy', {'q': 1}, {'value': 1})
+    cache.set('odds', {'q': 1}, {'value': 1})
+    cache.get('roomy', {'q': 1})
+    cache.set('roomy', {'q': 2}, {'value': 2})
+    assert cache.get('odds', {'q': 1}) is None
+    assert cache.stats()['entries'] == 2
+
+
+def test_byte_budget_evicts_until_it_fits(app, clock):
+    body = {'value': 'x' * 100}
+    size = len(app.ResponseCache.encode(body))
+    cache = app.ResponseCache(NAMESPACES, 100, 3 * size)
+    for q in range(4):
+        cache.set('roomy', {'q': q}, body)
+    stats = cache.stats()
+    assert stats['entries'] == 3
+    assert stats['bytes'] == 3 * size
+    assert cache.get('roomy', {'q': 0}) is None
+
+
+def test_oversized_values_are_sent_but_not_stored(app, clock):
+    cache = app.ResponseCache(NAMESPACES, 100, 50)
+    stored = cache.set('roomy', {'q': 1}, {'value': 'x' * 100})
+    assert stored.status == 'MISS'
+    assert cache.get('roomy', {'q': 1}) is None
+    assert cache.stats()['bytes'] == 0
+
+
+def test_large_bodies_are_stored_compressed(app, clock):
+    cache = app.ResponseCache(NAMESPACES, 100, 10 ** 6, compress_min_bytes=1024)
+    value = {'value': 'x' * 5000}
+    stored = cache.set('roomy', {'q': 1}, value)
+    assert app.ResponseCache.is_compressed(stored.payload)
+    assert json.loads(app.ResponseCache.body(cache.get('roomy', {'q': 1}).payload)) == value
+
+
+def test_dump_and_restore_round_trip(app, clock, tmp_path):
+    namespaces = dict(NAMESPACES, plain=(60, 3, True))
+    cache = app.ResponseCache(namespaces, 100, 10 ** 6)
+    stored = cache.set('plain', {'q': 1}, {'value': 1})
+    cache.set('roomy', {'q': 1}, {'value': 1})  # not a shared namespace
+    path = str(tmp_path / 'cache.json')
+    assert cache.dump(path) == 1
+
+    restored = app.ResponseCache(namespaces, 100, 10 ** 6)
+    assert restored.restore(path) == 1
+    assert restored.get('plain', {'q': 1}).etag == stored.etag
+    assert restored.get('roomy', {'q': 1}) is None
+
+
+@pytest.mark.parametrize('contents', [
+    b'\x80\x04garbage',
+    b'{"format": 2, "entries": [[1]]}',
+    b'{"format": 2, "entries": [["plain", "k", "not base64!", 1, 2]]}',
+    b'{"format": 2}'
+])
+def test_unreadable_dumps_restore_nothing(app, clock, tmp_path, contents):
+    path = tmp_path / 'cache.json'
+    path.write_bytes(contents)
+    cache = app.ResponseCache(NAMESPACES, 100, 10 ** 6)
+    assert cache.restore(str(path)) == 0
+    assert cache.dump(str(path)) == 0